@@ -7,7 +7,7 @@ by some font processors and prevents validation warnings.
 Uses direct fontTools API manipulation instead of TTX conversion for reliability.
 """
 
-from typing import Tuple
+from typing import Dict, Iterator, List, Tuple
 
 from fontTools.ttLib import TTFont
 
@@ -26,15 +26,16 @@ if str(_project_root) not in sys.path:
 import FontCore.core_console_styles as cs  # noqa: E402
 
 
-def get_glyph_id(font: TTFont, glyph_name: str) -> int:
-    """Get the glyph ID for a glyph name."""
-    try:
-        return font.getGlyphID(glyph_name)
-    except (KeyError, ValueError, AttributeError):
-        return float("inf")  # Put unknown glyphs at the end
+# Sort key for glyphs missing from the font, so they go at the end
+_UNKNOWN_GID = float("inf")
 
 
-def sort_coverage(font: TTFont, coverage) -> bool:
+def _is_sorted(gids: List[int]) -> bool:
+    """Check whether glyph IDs are already in non-decreasing order."""
+    return all(gids[i] <= gids[i + 1] for i in range(len(gids) - 1))
+
+
+def sort_coverage(gid_map: Dict[str, int], coverage) -> bool:
     """
     Sort a Coverage table by glyph IDs.
 
@@ -44,19 +45,22 @@ def sort_coverage(font: TTFont, coverage) -> bool:
     if not hasattr(coverage, "glyphs") or not coverage.glyphs:
         return False
 
+    # Get glyph IDs, skipping the sort when already in glyph order
+    gids = [gid_map.get(g, _UNKNOWN_GID) for g in coverage.glyphs]
+    if _is_sorted(gids):
+        return False
+
     # Get current order
     old_glyphs = list(coverage.glyphs)
 
-    # Get glyph IDs and sort
-    glyph_data = [(get_glyph_id(font, g), g) for g in coverage.glyphs]
-    glyph_data.sort(key=lambda x: x[0])
-    coverage.glyphs = [g for _, g in glyph_data]
+    # Sort by glyph ID (plain tuple comparison, GID first)
+    coverage.glyphs = [g for _, g in sorted(zip(gids, old_glyphs))]
 
     # Check if order changed
     return old_glyphs != coverage.glyphs
 
 
-def sort_class_def(font: TTFont, class_def) -> bool:
+def sort_class_def(gid_map: Dict[str, int], class_def) -> bool:
     """
     Sort a ClassDef table by glyph IDs.
 
@@ -67,77 +71,79 @@ def sort_class_def(font: TTFont, class_def) -> bool:
         return False
 
     # ClassDef is a dict, just ensure it's ordered by glyph ID
+    gids = [gid_map.get(g, _UNKNOWN_GID) for g in class_def.classDefs]
+    if _is_sorted(gids):
+        return False
+
     old_items = list(class_def.classDefs.items())
-    sorted_items = sorted(
-        class_def.classDefs.items(), key=lambda x: get_glyph_id(font, x[0])
-    )
+    sorted_items = [item for _, item in sorted(zip(gids, old_items))]
     class_def.classDefs = dict(sorted_items)
 
     # Check if order changed (dict order matters in Python 3.7+)
     return old_items != sorted_items
 
 
-def process_lookup(font: TTFont, lookup) -> int:
+def process_lookup(gid_map: Dict[str, int], lookup) -> Tuple[int, int]:
     """
-    Process a single lookup and sort all its Coverage tables.
+    Process a single lookup, counting and sorting all its Coverage tables.
 
     Returns:
-        Number of coverage tables sorted
+        (total_coverage, sorted_count) tuple
     """
+    total_coverage = 0
     sorted_count = 0
 
-    if not hasattr(lookup, "SubTable"):
-        return sorted_count
+    subtables = getattr(lookup, "SubTable", None)
+    if subtables is None:
+        return total_coverage, sorted_count
 
-    for subtable in lookup.SubTable:
-        # Sort main Coverage
-        if hasattr(subtable, "Coverage"):
-            if sort_coverage(font, subtable.Coverage):
+    for subtable in subtables:
+        # Sort main Coverage (PairPos sorts it below, together with PairSet)
+        coverage = getattr(subtable, "Coverage", None)
+        pair_set = getattr(subtable, "PairSet", None)
+        if coverage is not None:
+            if getattr(coverage, "glyphs", None):
+                total_coverage += 1
+            if pair_set is None and sort_coverage(gid_map, coverage):
                 sorted_count += 1
 
         # Handle different subtable types
-        if hasattr(subtable, "ClassDef"):
-            sort_class_def(font, subtable.ClassDef)
-
-        if hasattr(subtable, "BacktrackCoverage"):
-            for cov in subtable.BacktrackCoverage:
-                if sort_coverage(font, cov):
-                    sorted_count += 1
-
-        if hasattr(subtable, "InputCoverage"):
-            for cov in subtable.InputCoverage:
-                if sort_coverage(font, cov):
-                    sorted_count += 1
-
-        if hasattr(subtable, "LookAheadCoverage"):
-            for cov in subtable.LookAheadCoverage:
-                if sort_coverage(font, cov):
-                    sorted_count += 1
+        class_def = getattr(subtable, "ClassDef", None)
+        if class_def is not None:
+            sort_class_def(gid_map, class_def)
+
+        for attr in ("BacktrackCoverage", "InputCoverage", "LookAheadCoverage"):
+            coverages = getattr(subtable, attr, None)
+            if coverages is not None:
+                total_coverage += len(coverages)
+                for cov in coverages:
+                    if sort_coverage(gid_map, cov):
+                        sorted_count += 1
 
         # PairPos specific - reorder PairSet to match sorted Coverage
-        if hasattr(subtable, "PairSet"):
+        if pair_set is not None:
             try:
-                if hasattr(subtable.Coverage, "glyphs") and subtable.Coverage.glyphs:
+                if getattr(coverage, "glyphs", None):
                     # Need to reorder PairSet to match sorted Coverage
-                    old_glyphs = list(subtable.Coverage.glyphs)
-                    if sort_coverage(font, subtable.Coverage):
+                    old_glyphs = list(coverage.glyphs)
+                    if sort_coverage(gid_map, coverage):
                         sorted_count += 1
-                    new_glyphs = subtable.Coverage.glyphs
+                    new_glyphs = coverage.glyphs
 
                     # Create mapping from old position to new position
+                    new_pos_map = {g: i for i, g in enumerate(new_glyphs)}
                     old_to_new = {}
                     for old_idx, glyph in enumerate(old_glyphs):
-                        if glyph in new_glyphs:
-                            new_idx = new_glyphs.index(glyph)
-                            old_to_new[old_idx] = new_idx
+                        if glyph in new_pos_map:
+                            old_to_new[old_idx] = new_pos_map[glyph]
 
                     # Reorder PairSet array
-                    if subtable.PairSet and len(old_to_new) == len(old_glyphs):
-                        old_pairset = subtable.PairSet[:]
-                        new_pairset = [None] * len(old_pairset)
+                    if pair_set and len(old_to_new) == len(old_glyphs):
+                        # Permute straight from the source; it is never mutated
+                        new_pairset = [None] * len(pair_set)
                         for old_idx, new_idx in old_to_new.items():
-                            if old_idx < len(old_pairset):
-                                new_pairset[new_idx] = old_pairset[old_idx]
+                            if old_idx < len(pair_set):
+                                new_pairset[new_idx] = pair_set[old_idx]
 
                         # Validate no None values remain
                         if None not in new_pairset:
@@ -146,15 +152,15 @@ def process_lookup(font: TTFont, lookup) -> int:
                 pass
 
         # LigatureSubst specific - reorder ligature sets
-        if hasattr(subtable, "ligatures"):
+        ligatures = getattr(subtable, "ligatures", None)
+        if ligatures is not None:
             try:
-                if hasattr(subtable.Coverage, "glyphs") and subtable.Coverage.glyphs:
-                    old_glyphs = list(subtable.Coverage.glyphs)
-                    if sort_coverage(font, subtable.Coverage):
+                if getattr(coverage, "glyphs", None):
+                    if sort_coverage(gid_map, coverage):
                         sorted_count += 1
-                    new_glyphs = subtable.Coverage.glyphs
+                    new_glyphs = coverage.glyphs
 
-                    old_ligatures = subtable.ligatures.copy()
+                    old_ligatures = ligatures.copy()
                     new_ligatures = {}
                     for glyph in new_glyphs:
                         if glyph in old_ligatures:
@@ -163,10 +169,19 @@ def process_lookup(font: TTFont, lookup) -> int:
             except (AttributeError, TypeError):
                 pass
 
-    return sorted_count
+    return total_coverage, sorted_count
+
+
+def _iter_lookups(table) -> Iterator:
+    """Yield the lookups of a GSUB/GPOS table, if it has a LookupList."""
+    lookup_list = getattr(table, "LookupList", None)
+    if lookup_list:
+        yield from lookup_list.Lookup
 
 
-def process_table(font: TTFont, table_tag: str) -> Tuple[int, int]:
+def process_table(
+    font: TTFont, table_tag: str, gid_map: Dict[str, int]
+) -> Tuple[int, int]:
     """
     Process GSUB or GPOS table.
 
@@ -180,38 +195,18 @@ def process_table(font: TTFont, table_tag: str) -> Tuple[int, int]:
         return total_coverage, sorted_count
 
     table = font[table_tag]
+    table = getattr(table, "table", table)
 
-    if hasattr(table, "table"):
-        table = table.table
-
-    # Process all lookup lists
-    if hasattr(table, "LookupList") and table.LookupList:
-        for lookup in table.LookupList.Lookup:
-            # Count coverage tables in this lookup
-            if hasattr(lookup, "SubTable"):
-                for subtable in lookup.SubTable:
-                    # Count main Coverage
-                    if hasattr(subtable, "Coverage") and hasattr(
-                        subtable.Coverage, "glyphs"
-                    ):
-                        if subtable.Coverage.glyphs:
-                            total_coverage += 1
-
-                    # Count contextual coverage
-                    if hasattr(subtable, "BacktrackCoverage"):
-                        total_coverage += len(subtable.BacktrackCoverage)
-                    if hasattr(subtable, "InputCoverage"):
-                        total_coverage += len(subtable.InputCoverage)
-                    if hasattr(subtable, "LookAheadCoverage"):
-                        total_coverage += len(subtable.LookAheadCoverage)
-
-            # Sort coverage in this lookup
-            sorted_count += process_lookup(font, lookup)
+    # Count and sort coverage lookup by lookup in one walk
+    for lookup in _iter_lookups(table):
+        lookup_total, lookup_sorted = process_lookup(gid_map, lookup)
+        total_coverage += lookup_total
+        sorted_count += lookup_sorted
 
     return total_coverage, sorted_count
 
 
-def process_gdef(font: TTFont) -> Tuple[int, int]:
+def process_gdef(font: TTFont, gid_map: Dict[str, int]) -> Tuple[int, int]:
     """
     Process GDEF table.
 
@@ -227,51 +222,51 @@ def process_gdef(font: TTFont) -> Tuple[int, int]:
     gdef = font["GDEF"].table
 
     # Sort LigCaretList Coverage
-    if hasattr(gdef, "LigCaretList") and gdef.LigCaretList:
-        lig_caret = gdef.LigCaretList
-        if hasattr(lig_caret, "Coverage") and hasattr(lig_caret.Coverage, "glyphs"):
-            if lig_caret.Coverage.glyphs:
-                total_coverage += 1
-                old_glyphs = list(lig_caret.Coverage.glyphs)
-                if sort_coverage(font, lig_caret.Coverage):
-                    sorted_count += 1
-                new_glyphs = lig_caret.Coverage.glyphs
-
-                # Reorder LigGlyph array to match sorted Coverage
-                if hasattr(lig_caret, "LigGlyph") and lig_caret.LigGlyph and old_glyphs:
-                    old_lig_glyphs = lig_caret.LigGlyph[:]
-                    new_lig_glyphs = [None] * len(old_lig_glyphs)
-
-                    for i, old_glyph in enumerate(old_glyphs):
-                        if old_glyph in new_glyphs and i < len(old_lig_glyphs):
-                            new_idx = new_glyphs.index(old_glyph)
-                            new_lig_glyphs[new_idx] = old_lig_glyphs[i]
-
-                    # Validate no None values remain before assigning
-                    if None in new_lig_glyphs:
-                        lig_caret.LigGlyph = [
-                            lg for lg in new_lig_glyphs if lg is not None
-                        ]
-                    else:
-                        lig_caret.LigGlyph = new_lig_glyphs
+    lig_caret = getattr(gdef, "LigCaretList", None)
+    if lig_caret:
+        coverage = getattr(lig_caret, "Coverage", None)
+        if coverage is not None and getattr(coverage, "glyphs", None):
+            total_coverage += 1
+            old_glyphs = list(coverage.glyphs)
+            if sort_coverage(gid_map, coverage):
+                sorted_count += 1
+            new_glyphs = coverage.glyphs
+
+            # Reorder LigGlyph array to match sorted Coverage
+            lig_glyphs = getattr(lig_caret, "LigGlyph", None)
+            if lig_glyphs and old_glyphs:
+                new_lig_glyphs = [None] * len(lig_glyphs)
+                new_pos_map = {g: i for i, g in enumerate(new_glyphs)}
+
+                for i, old_glyph in enumerate(old_glyphs):
+                    if old_glyph in new_pos_map and i < len(lig_glyphs):
+                        new_idx = new_pos_map[old_glyph]
+                        new_lig_glyphs[new_idx] = lig_glyphs[i]
+
+                # Validate no None values remain before assigning
+                if None in new_lig_glyphs:
+                    lig_caret.LigGlyph = [lg for lg in new_lig_glyphs if lg is not None]
+                else:
+                    lig_caret.LigGlyph = new_lig_glyphs
 
     # Sort AttachList Coverage
-    if hasattr(gdef, "AttachList") and gdef.AttachList:
-        if hasattr(gdef.AttachList, "Coverage") and hasattr(
-            gdef.AttachList.Coverage, "glyphs"
-        ):
-            if gdef.AttachList.Coverage.glyphs:
-                total_coverage += 1
-                if sort_coverage(font, gdef.AttachList.Coverage):
-                    sorted_count += 1
+    attach_list = getattr(gdef, "AttachList", None)
+    if attach_list:
+        coverage = getattr(attach_list, "Coverage", None)
+        if coverage is not None and getattr(coverage, "glyphs", None):
+            total_coverage += 1
+            if sort_coverage(gid_map, coverage):
+                sorted_count += 1
 
     # Sort MarkAttachClassDef
-    if hasattr(gdef, "MarkAttachClassDef") and gdef.MarkAttachClassDef:
-        sort_class_def(font, gdef.MarkAttachClassDef)
+    mark_attach_class_def = getattr(gdef, "MarkAttachClassDef", None)
+    if mark_attach_class_def:
+        sort_class_def(gid_map, mark_attach_class_def)
 
     # Sort GlyphClassDef
-    if hasattr(gdef, "GlyphClassDef") and gdef.GlyphClassDef:
-        sort_class_def(font, gdef.GlyphClassDef)
+    glyph_class_def = getattr(gdef, "GlyphClassDef", None)
+    if glyph_class_def:
+        sort_class_def(gid_map, glyph_class_def)
 
     return total_coverage, sorted_count
 
@@ -298,18 +293,21 @@ def sort_coverage_tables_in_font(
     total_coverage = 0
     sorted_count = 0
 
+    # Glyph IDs are looked up for every sort key, so resolve each only once
+    gid_map = font.getReverseGlyphMap()
+
     # Process GSUB table
-    gsub_total, gsub_sorted = process_table(font, "GSUB")
+    gsub_total, gsub_sorted = process_table(font, "GSUB", gid_map)
     total_coverage += gsub_total
     sorted_count += gsub_sorted
 
     # Process GPOS table
-    gpos_total, gpos_sorted = process_table(font, "GPOS")
+    gpos_total, gpos_sorted = process_table(font, "GPOS", gid_map)
     total_coverage += gpos_total
     sorted_count += gpos_sorted
 
     # Process GDEF table
-    gdef_total, gdef_sorted = process_gdef(font)
+    gdef_total, gdef_sorted = process_gdef(font, gid_map)
     total_coverage += gdef_total
     sorted_count += gdef_sorted
 
@@ -5,8 +5,10 @@ Single-pass classification of all glyphs for feature detection.
 """
 
 import re
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from fontTools.agl import toUnicode
 from fontTools.ttLib import TTFont
@@ -14,13 +16,26 @@ from fontTools.ttLib import TTFont
 from .config import CONFIG
 
 
+@lru_cache(maxsize=1024)
+def _is_precomposed_ligature(base: str) -> bool:
+    """Check if a glyph name maps to a precomposed Unicode ligature."""
+    try:
+        uni = toUnicode(base)
+        if uni and len(uni) == 1:
+            name = unicodedata.name(uni, "")
+            return "LIGATURE" in name
+    except Exception:
+        pass
+    return False
+
+
 @dataclass
 class GlyphClassification:
     """Classification of a single glyph."""
 
     name: str
     is_ligature: bool = False
-    ligature_components: List[str] = field(default_factory=list)
+    ligature_components: Optional[List[str]] = None
 
     is_stylistic_alternate: bool = False
     ss_number: Optional[int] = None
@@ -52,12 +67,27 @@ class GlyphClassification:
 class UnifiedGlyphDetector:
     """Single-pass glyph pattern detector."""
 
-    # Compile patterns once
-    SS_PATTERN = re.compile(r"^(.+)\.ss(\d{2})$")
-    SC_PATTERN = re.compile(r"^(.+)\.(sc|smallcap)$")
-    SWSH_PATTERN = re.compile(r"^(.+)\.(swsh|swash)$")
-    CALT_PATTERN = re.compile(r"^(.+)\.(calt|alt)(\d+)?$")
-    DLIG_PATTERN = re.compile(r"^(.+)\.dlig$")
+    # Compile suffix patterns once, as a single alternation
+    SUFFIX_PATTERN = re.compile(
+        r"^(?P<base>.+)\.(?:"
+        r"ss(?P<ss>\d{2})"
+        r"|(?P<sc>sc|smallcap)"
+        r"|(?P<sw>swsh|swash)"
+        r"|(?P<ca>calt|alt)(?P<can>\d+)?"
+        r"|(?P<dl>dlig)"
+        r")$"
+    )
+
+    # Suffix token (after the last ".") -> feature kind, for direct dispatch
+    SUFFIX_KINDS = {
+        "sc": "smcp",
+        "smallcap": "smcp",
+        "swsh": "swsh",
+        "swash": "swsh",
+        "calt": "calt",
+        "alt": "calt",
+        **{f"ss{n:02d}": "ss" for n in range(1, 100)},
+    }
 
     FIGURE_SUFFIXES = {
         "onum": [".oldstyle", ".onum"],
@@ -68,9 +98,19 @@ class UnifiedGlyphDetector:
 
     def __init__(self, font: TTFont):
         self.font = font
-        self.glyph_order = set(font.getGlyphOrder())
+        order = font.getGlyphOrder()
+        self.glyph_order_list = tuple(order)  # stable iteration order
+        self.glyph_order = frozenset(order)  # membership checks
         self.best_cmap = font.getBestCmap() or {}
+        self.cmap_glyphs = frozenset(self.best_cmap.values())
         self.inv_cmap = self._invert_cmap()
+        self._mark_re = re.compile("|".join(f"(?:{p})" for p in CONFIG.MARK_PATTERNS))
+        self._fig_suffix_map = {
+            suffix: (variant_type, len(suffix))
+            for variant_type, suffixes in self.FIGURE_SUFFIXES.items()
+            for suffix in suffixes
+        }
+        self._fig_suffixes_tuple = tuple(self._fig_suffix_map)
 
     def _invert_cmap(self) -> Dict[str, List[int]]:
         """Invert cmap: glyph name -> list of codepoints."""
@@ -83,17 +123,48 @@ class UnifiedGlyphDetector:
         """Classify all glyphs in a single pass."""
         classifications = {}
 
-        for glyph_name in self.glyph_order:
-            classification = GlyphClassification(name=glyph_name)
+        for glyph_name in self.glyph_order_list:
+            classifications[glyph_name] = self._classify_one(glyph_name)
+
+        return classifications
+
+    def _classify_one(self, glyph_name: str) -> GlyphClassification:
+        """Classify a single glyph, splitting its name only once."""
+        classification = GlyphClassification(name=glyph_name)
+        glyph_order = self.glyph_order
+
+        base_name, dot, suffix = glyph_name.rpartition(".")
+        if base_name:
+            kind = self.SUFFIX_KINDS.get(suffix)
+            if kind is None and suffix.startswith(("ss", "alt", "calt")):
+                # Rare spellings (e.g. alt2, calt10) go through the regex once
+                match = self.SUFFIX_PATTERN.match(glyph_name)
+                if match is not None:
+                    if match.group("ss"):
+                        kind = "ss"
+                    elif match.group("ca"):
+                        kind = "calt"
+
+            if kind is not None and base_name in glyph_order:
+                if kind == "ss":
+                    ss_num = int(suffix[2:])
+                    if 1 <= ss_num <= 99:
+                        classification.is_stylistic_alternate = True
+                        classification.ss_number = ss_num
+                        classification.base_glyph = base_name
+                elif kind == "smcp":
+                    classification.is_small_cap = True
+                    classification.base_glyph = base_name
+                elif kind == "swsh":
+                    classification.is_swash = True
+                    classification.base_glyph = base_name
+                elif kind == "calt":
+                    classification.is_contextual_alternate = True
+                    classification.base_glyph = base_name
 
-            # Check each pattern
-            self._check_ligature(glyph_name, classification)
-            self._check_stylistic_set(glyph_name, classification)
-            self._check_small_cap(glyph_name, classification)
+        if dot:
+            # Suffix-based variants all require a "." in the name
             self._check_figure_variant(glyph_name, classification)
-            self._check_swash(glyph_name, classification)
-            self._check_contextual_alternate(glyph_name, classification)
-            self._check_mark(glyph_name, classification)
             # Phase 1 enhanced features
             self._check_fraction(glyph_name, classification)
             self._check_superscript(glyph_name, classification)
@@ -105,9 +176,10 @@ class UnifiedGlyphDetector:
             self._check_case_sensitive(glyph_name, classification)
             self._check_titling(glyph_name, classification)
 
-            classifications[glyph_name] = classification
+        self._check_mark(glyph_name, classification)
+        self._check_ligature(glyph_name, classification)
 
-        return classifications
+        return classification
 
     def _check_ligature(self, glyph_name: str, classification: GlyphClassification):
         """Check if glyph is a ligature."""
@@ -118,8 +190,6 @@ class UnifiedGlyphDetector:
 
     def _parse_ligature_components(self, glyph_name: str) -> List[str]:
         """Parse ligature components with validation."""
-        import unicodedata
-
         base = glyph_name.split(".")[0]
 
         if "_" in base:
@@ -128,15 +198,8 @@ class UnifiedGlyphDetector:
             part1, part2 = base[0], base[1]
 
             # Check if this is a precomposed Unicode ligature
-            try:
-                uni = toUnicode(base)
-                if uni and len(uni) == 1:
-                    cp = ord(uni)
-                    name = unicodedata.name(chr(cp), "")
-                    if "LIGATURE" in name:
-                        return []
-            except Exception:
-                pass
+            if _is_precomposed_ligature(base):
+                return []
 
             if part1 not in self.glyph_order or part2 not in self.glyph_order:
                 return []
@@ -167,90 +230,45 @@ class UnifiedGlyphDetector:
             return []
 
         # Validate: at least half components should have Unicode
-        valid_components = sum(
-            1 for comp in resolved if comp in self.best_cmap.values()
-        )
+        valid_components = sum(1 for comp in resolved if comp in self.cmap_glyphs)
         if valid_components < len(resolved) / 2:
             return []
 
         return resolved
 
-    def _check_stylistic_set(
-        self, glyph_name: str, classification: GlyphClassification
-    ):
-        """Check if glyph is a stylistic alternate."""
-        match = self.SS_PATTERN.match(glyph_name)
-        if match:
-            base_name = match.group(1)
-            ss_num = int(match.group(2))
-            if 1 <= ss_num <= 99 and base_name in self.glyph_order:
-                classification.is_stylistic_alternate = True
-                classification.ss_number = ss_num
-                classification.base_glyph = base_name
-
-    def _check_small_cap(self, glyph_name: str, classification: GlyphClassification):
-        """Check if glyph is a small cap."""
-        match = self.SC_PATTERN.match(glyph_name)
-        if match:
-            base_name = match.group(1)
-            if base_name in self.glyph_order:
-                classification.is_small_cap = True
-                classification.base_glyph = base_name
-
     def _check_figure_variant(
         self, glyph_name: str, classification: GlyphClassification
     ):
         """Check if glyph is a figure variant."""
-        for variant_type, suffixes in self.FIGURE_SUFFIXES.items():
-            for suffix in suffixes:
-                if glyph_name.endswith(suffix):
-                    base_name = glyph_name[: -len(suffix)]
-                    if base_name in self.glyph_order:
-                        classification.is_figure_variant = True
-                        classification.figure_variant_type = variant_type
-                        classification.base_glyph = base_name
-                        return
-
-    def _check_swash(self, glyph_name: str, classification: GlyphClassification):
-        """Check if glyph is a swash."""
-        match = self.SWSH_PATTERN.match(glyph_name)
-        if match:
-            base_name = match.group(1)
-            if base_name in self.glyph_order:
-                classification.is_swash = True
-                classification.base_glyph = base_name
-
-    def _check_contextual_alternate(
-        self, glyph_name: str, classification: GlyphClassification
-    ):
-        """Check if glyph is a contextual alternate."""
-        match = self.CALT_PATTERN.match(glyph_name)
-        if match:
-            base_name = match.group(1)
-            if base_name in self.glyph_order:
-                classification.is_contextual_alternate = True
-                classification.base_glyph = base_name
+        if not glyph_name.endswith(self._fig_suffixes_tuple):
+            return
+
+        for suffix in self._fig_suffixes_tuple:
+            if glyph_name.endswith(suffix):
+                variant_type, suffix_len = self._fig_suffix_map[suffix]
+                base_name = glyph_name[:-suffix_len]
+                if base_name in self.glyph_order:
+                    classification.is_figure_variant = True
+                    classification.figure_variant_type = variant_type
+                    classification.base_glyph = base_name
+                    return
 
     def _check_mark(self, glyph_name: str, classification: GlyphClassification):
         """Check if glyph is a mark."""
-        import unicodedata
-
         # Unicode category check
         if glyph_name in self.inv_cmap:
+            category = unicodedata.category
             for cp in self.inv_cmap[glyph_name]:
-                cat = unicodedata.category(chr(cp))
+                cat = category(chr(cp))
                 if cat in ("Mn", "Mc", "Me"):
                     classification.is_mark = True
                     classification.mark_class = "unicode"
                     return
 
         # Pattern-based detection
-        lower = glyph_name.lower()
-        for pattern in CONFIG.MARK_PATTERNS:
-            if re.match(pattern, lower):
-                classification.is_mark = True
-                classification.mark_class = "pattern"
-                return
+        if self._mark_re.match(glyph_name.lower()):
+            classification.is_mark = True
+            classification.mark_class = "pattern"
 
     def _check_fraction(self, glyph_name: str, classification: GlyphClassification):
         """Check if glyph is a fraction numerator or denominator."""
@@ -363,8 +381,44 @@ class UnifiedGlyphDetector:
 
     def get_features(self) -> Dict[str, any]:
         """Extract features from classifications."""
-        classifications = self.classify_all_glyphs()
-
+        return self._emit_features(map(self._classify_one, self.glyph_order_list))
+
+    def analyze_all(self, lookup_list=None) -> Tuple[List[tuple], Set[str], Set[tuple]]:
+        """
+        Run the glyph analysis needed for wrapper planning in one call.
+
+        Args:
+            lookup_list: GSUB LookupList to read existing ligatures from (optional)
+
+        Returns:
+            (ligatures, marks, existing_liga_components) tuple
+        """
+        classifications = list(map(self._classify_one, self.glyph_order_list))
+        features = self._emit_features(classifications)
+        marks = {c.name for c in classifications if c.is_mark}
+        existing = self.existing_ligature_components(lookup_list)
+        return features["liga"], marks, existing
+
+    @staticmethod
+    def existing_ligature_components(lookup_list) -> Set[tuple]:
+        """Component sequences of the ligatures in a GSUB LookupList."""
+        components = set()
+        if lookup_list:
+            components.update(
+                (first_glyph, *lig.Component)
+                for lookup in lookup_list.Lookup
+                if lookup.LookupType == 4  # Ligature
+                for subtable in lookup.SubTable
+                if hasattr(subtable, "ligatures")
+                for first_glyph, lig_list in subtable.ligatures.items()
+                for lig in lig_list
+            )
+        return components
+
+    def _emit_features(
+        self, classifications: Iterable[GlyphClassification]
+    ) -> Dict[str, any]:
+        """File each glyph classification into its feature bucket as it arrives."""
         features = {
             "liga": [],
             "dlig": [],
@@ -388,74 +442,76 @@ class UnifiedGlyphDetector:
             "titl": [],
         }
 
-        for glyph_name, classification in classifications.items():
+        liga = features["liga"]
+        dlig = features["dlig"]
+        stylistic_sets = features["stylistic_sets"]
+        numerators = features["frac"]["numerators"]
+        denominators = features["frac"]["denominators"]
+
+        for classification in classifications:
+            glyph_name = classification.name
+            base = classification.base_glyph
+
             if classification.is_ligature:
+                components = classification.ligature_components or []
                 # Check if it's discretionary (has .dlig suffix)
-                if self.DLIG_PATTERN.match(glyph_name):
-                    features["dlig"].append(
-                        (classification.ligature_components, glyph_name)
-                    )
+                match = self.SUFFIX_PATTERN.match(glyph_name)
+                if match is not None and match.group("dl"):
+                    dlig.append((components, glyph_name))
                 else:
-                    features["liga"].append(
-                        (classification.ligature_components, glyph_name)
-                    )
+                    liga.append((components, glyph_name))
 
             if classification.is_stylistic_alternate:
                 ss_num = classification.ss_number
-                base = classification.base_glyph
-                features["stylistic_sets"].setdefault(ss_num, []).append(
-                    (base, glyph_name)
-                )
+                stylistic_sets.setdefault(ss_num, []).append((base, glyph_name))
+
+            if not base:
+                continue
+
+            pair = (base, glyph_name)
 
-            if classification.is_small_cap and classification.base_glyph:
-                features["smcp"].append((classification.base_glyph, glyph_name))
+            if classification.is_small_cap:
+                features["smcp"].append(pair)
 
-            if classification.is_figure_variant and classification.base_glyph:
-                variant_type = classification.figure_variant_type
-                if variant_type:
-                    features[variant_type].append(
-                        (classification.base_glyph, glyph_name)
-                    )
+            variant_type = classification.figure_variant_type
+            if classification.is_figure_variant and variant_type:
+                features[variant_type].append(pair)
 
-            if classification.is_swash and classification.base_glyph:
-                features["swsh"].append((classification.base_glyph, glyph_name))
+            if classification.is_swash:
+                features["swsh"].append(pair)
 
-            if classification.is_contextual_alternate and classification.base_glyph:
-                features["calt"].append((classification.base_glyph, glyph_name))
+            if classification.is_contextual_alternate:
+                features["calt"].append(pair)
 
             # Phase 1 enhanced features
-            if classification.is_fraction_numerator and classification.base_glyph:
-                features["frac"]["numerators"].append(
-                    (classification.base_glyph, glyph_name)
-                )
+            if classification.is_fraction_numerator:
+                numerators.append(pair)
 
-            if classification.is_fraction_denominator and classification.base_glyph:
-                features["frac"]["denominators"].append(
-                    (classification.base_glyph, glyph_name)
-                )
+            if classification.is_fraction_denominator:
+                denominators.append(pair)
 
-            if classification.is_superscript and classification.base_glyph:
-                features["sups"].append((classification.base_glyph, glyph_name))
+            if classification.is_superscript:
+                features["sups"].append(pair)
 
-            if classification.is_subscript and classification.base_glyph:
-                features["subs"].append((classification.base_glyph, glyph_name))
+            if classification.is_subscript:
+                features["subs"].append(pair)
 
-            if classification.is_ordinal and classification.base_glyph:
-                features["ordn"].append((classification.base_glyph, glyph_name))
+            if classification.is_ordinal:
+                features["ordn"].append(pair)
 
-            if classification.is_c2sc and classification.base_glyph:
-                features["c2sc"].append((classification.base_glyph, glyph_name))
+            if classification.is_c2sc:
+                features["c2sc"].append(pair)
 
-            if classification.is_salt_alternate and classification.base_glyph:
-                features["salt"].append((classification.base_glyph, glyph_name))
+            if classification.is_salt_alternate:
+                features["salt"].append(pair)
 
-            if classification.is_slashed_zero and classification.base_glyph:
-                features["zero"].append((classification.base_glyph, glyph_name))
+            if classification.is_slashed_zero:
+                features["zero"].append(pair)
 
-            if classification.is_case_sensitive and classification.base_glyph:
-                features["case"].append((classification.base_glyph, glyph_name))
+            if classification.is_case_sensitive:
+                features["case"].append(pair)
 
-            if classification.is_titling and classification.base_glyph:
-                features["titl"].append((classification.base_glyph, glyph_name))
+            if classification.is_titling:
+                features["titl"].append(pair)
 
         return features
@@ -254,19 +254,21 @@ class ExistingSubstitutionExtractor:
         if not hasattr(gsub, "LookupList") or not gsub.LookupList:
             return result
 
+        # Bind the set methods once for the inner loops
+        update_single = result["single"].update
+        add_ligature = result["ligatures"].add
+
         for lookup in gsub.LookupList.Lookup:
             if lookup.LookupType == 1:  # Single substitution
                 for subtable in lookup.SubTable:
                     if hasattr(subtable, "mapping"):
-                        for inp, out in subtable.mapping.items():
-                            result["single"].add((inp, out))
+                        update_single(subtable.mapping.items())
 
             elif lookup.LookupType == 4:  # Ligature substitution
                 for subtable in lookup.SubTable:
                     if hasattr(subtable, "ligatures"):
                         for first_glyph, lig_list in subtable.ligatures.items():
                             for lig in lig_list:
-                                components = tuple([first_glyph] + lig.Component)
-                                result["ligatures"].add(components)
+                                add_ligature((first_glyph, *lig.Component))
 
         return result
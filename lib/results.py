@@ -34,6 +34,9 @@ class ResultLevel(Enum):
     CRITICAL = "critical"
 
 
+_ERROR_LEVELS = frozenset({ResultLevel.ERROR, ResultLevel.CRITICAL})
+
+
 @dataclass
 class ResultMessage:
     """Single result message."""
@@ -57,6 +60,10 @@ class OperationResult:
     success: bool = True
     messages: List[ResultMessage] = field(default_factory=list)
     data: Optional[Any] = None
+    _error_count: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._error_count = sum(1 for m in self.messages if m.level in _ERROR_LEVELS)
 
     def add_message(
         self,
@@ -67,6 +74,13 @@ class OperationResult:
     ):
         """Add a message to the result."""
         self.messages.append(ResultMessage(level, message, details, context))
+        if level in _ERROR_LEVELS:
+            self._error_count += 1
+
+    def merge(self, other: "OperationResult"):
+        """Append another result's messages to this one."""
+        self.messages.extend(other.messages)
+        self._error_count += other._error_count
 
     def add_success(self, message: str, details: Optional[str] = None):
         """Add a success message."""
@@ -91,11 +105,8 @@ class OperationResult:
         self.success = False
 
     def has_errors(self) -> bool:
-        """Check if result has any errors."""
-        return any(
-            m.level == ResultLevel.ERROR or m.level == ResultLevel.CRITICAL
-            for m in self.messages
-        )
+        """Check if result has any errors (counted by add_message and merge)."""
+        return self._error_count > 0
 
     def has_warnings(self) -> bool:
         """Check if result has any warnings."""
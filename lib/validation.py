@@ -242,7 +242,7 @@ class FontValidator:
             )
             return result
 
-        # Check what can be enriched
+        # Check what can be enriched (bulleted as they are recorded)
         enrichment_opportunities = []
 
         if self.state.has_kern and self.state.kern_pair_count > 0:
@@ -253,7 +253,8 @@ class FontValidator:
                 )
             else:
                 enrichment_opportunities.append(
-                    f"Migrate kern table ({self.state.kern_pair_count} pairs) → GPOS"
+                    f"  • Migrate kern table ({self.state.kern_pair_count} pairs)"
+                    " → GPOS"
                 )
 
         # Check for ligature opportunities
@@ -264,10 +265,12 @@ class FontValidator:
                     f"Found {lig_count} potential ligatures",
                     "GSUB liga already exists. Will check for duplicates.",
                 )
-                enrichment_opportunities.append("Add new ligatures (if not duplicates)")
+                enrichment_opportunities.append(
+                    "  • Add new ligatures (if not duplicates)"
+                )
             else:
                 enrichment_opportunities.append(
-                    f"Create liga feature ({lig_count} ligatures)"
+                    f"  • Create liga feature ({lig_count} ligatures)"
                 )
 
         # Check for GDEF enrichment
@@ -275,18 +278,18 @@ class FontValidator:
             mark_count = len(self._detect_marks())
             if mark_count > 0:
                 enrichment_opportunities.append(
-                    f"Add GDEF glyph classes ({mark_count} marks detected)"
+                    f"  • Add GDEF glyph classes ({mark_count} marks detected)"
                 )
 
         if not self.state.gdef_has_carets and lig_count > 0:
             enrichment_opportunities.append(
-                f"Add ligature carets ({lig_count} ligatures)"
+                f"  • Add ligature carets ({lig_count} ligatures)"
             )
 
         if enrichment_opportunities:
             result.add_success(
                 f"Font can be enriched ({len(enrichment_opportunities)} opportunities)",
-                "\n".join(f"  • {opp}" for opp in enrichment_opportunities),
+                "\n".join(enrichment_opportunities),
             )
         else:
             result.add_info(
@@ -4,10 +4,10 @@ Wrapper strategy and execution for OpenType table scaffolding.
 Provides validation-first approach to adding table scaffolding and enrichment.
 """
 
-from dataclasses import dataclass, field
-from typing import List, Set, Tuple
+from __future__ import annotations
 
-from fontTools.ttLib import TTFont
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Set, Tuple
 
 from .detection import UnifiedGlyphDetector
 from .results import OperationResult, ResultLevel
@@ -21,6 +21,17 @@ from .wrapper_helpers import (
     enrich_font,
 )
 
+if TYPE_CHECKING:
+    from fontTools.ttLib import TTFont
+
+
+# (user preference key, table tag) for overwritable OpenType Layout tables
+_OTL_TABLES = (
+    ("overwrite_gdef", "GDEF"),
+    ("overwrite_gsub", "GSUB"),
+    ("overwrite_gpos", "GPOS"),
+)
+
 
 @dataclass
 class WrapperPlan:
@@ -46,33 +57,35 @@ class WrapperPlan:
 
     def has_work(self) -> bool:
         """Check if any work needs to be done."""
+        # Enrichment flags first: they are set far more often than scaffolding
         return (
-            self.needs_cmap
+            self.can_enrich_gdef
+            or self.can_infer_liga
+            or self.can_migrate_kern
             or self.needs_gdef
-            or self.needs_gsub
             or self.needs_gpos
-            or self.can_migrate_kern
-            or self.can_infer_liga
-            or self.can_enrich_gdef
+            or self.needs_gsub
+            or self.needs_cmap
         )
 
     def summarize(self) -> str:
         """Human-readable summary of the plan."""
+        # Bullets are added as each action is recorded
         actions = []
 
         if self.needs_cmap:
-            actions.append("Create Unicode cmap from glyph names")
+            actions.append("• Create Unicode cmap from glyph names")
         if self.needs_gdef:
-            actions.append("Create GDEF table")
+            actions.append("• Create GDEF table")
         if self.needs_gsub:
-            actions.append("Create GSUB table")
+            actions.append("• Create GSUB table")
         if self.needs_gpos:
-            actions.append("Create GPOS table")
+            actions.append("• Create GPOS table")
 
         if self.can_migrate_kern:
-            actions.append(f"Migrate {self.kern_pair_count} kern pairs → GPOS")
+            actions.append(f"• Migrate {self.kern_pair_count} kern pairs → GPOS")
         if self.can_infer_liga:
-            actions.append(f"Create liga feature with {self.liga_count} ligatures")
+            actions.append(f"• Create liga feature with {self.liga_count} ligatures")
         if self.can_enrich_gdef:
             details = []
             if self.mark_count > 0:
@@ -80,14 +93,14 @@ class WrapperPlan:
             if self.ligature_caret_count > 0:
                 details.append(f"{self.ligature_caret_count} lig carets")
             if details:
-                actions.append(f"Enrich GDEF ({', '.join(details)})")
+                actions.append(f"• Enrich GDEF ({', '.join(details)})")
             else:
-                actions.append("Enrich GDEF")
+                actions.append("• Enrich GDEF")
 
         if not actions:
             return "No changes needed"
 
-        return "\n".join(f"• {action}" for action in actions)
+        return "\n".join(actions)
 
 
 class WrapperStrategyEngine:
@@ -110,6 +123,7 @@ class WrapperStrategyEngine:
         Returns:
             (plan, validation_result)
         """
+        state = self.state  # read on nearly every line below
         plan = WrapperPlan()
         result = OperationResult(success=True)
 
@@ -117,19 +131,19 @@ class WrapperStrategyEngine:
         result.add_info("Analyzing font state...")
 
         # Determine what scaffolding is needed
-        if not self.state.has_unicode_cmap:
+        if not state.has_unicode_cmap:
             plan.needs_cmap = True
             result.add_info("Unicode cmap missing or incomplete")
 
-        if not self.state.has_gdef:
+        if not state.has_gdef:
             plan.needs_gdef = True
             result.add_info("GDEF table missing")
 
-        if not self.state.has_gsub:
+        if not state.has_gsub:
             plan.needs_gsub = True
             result.add_info("GSUB table missing")
 
-        if not self.state.has_gpos:
+        if not state.has_gpos:
             plan.needs_gpos = True
             result.add_info("GPOS table missing")
 
@@ -137,17 +151,17 @@ class WrapperStrategyEngine:
         enrich = user_preferences.get("enrich", True)
 
         if enrich:
-            if not self.state.can_enrich():
+            if not state.can_enrich():
                 result.add_warning(
                     "Cannot enrich font: no usable Unicode cmap",
                     "Will only add table scaffolding",
                 )
             else:
                 # Check kern migration
-                if self.state.has_kern and self.state.kern_pair_count > 0:
-                    if "kern" not in self.state.gpos_features:
+                if state.has_kern and state.kern_pair_count > 0:
+                    if "kern" not in state.gpos_features:
                         plan.can_migrate_kern = True
-                        plan.kern_pair_count = self.state.kern_pair_count
+                        plan.kern_pair_count = state.kern_pair_count
                         result.add_info(
                             f"Can migrate {plan.kern_pair_count} kern pairs to GPOS"
                         )
@@ -155,38 +169,36 @@ class WrapperStrategyEngine:
                         result.add_info("Kern already in GPOS, skipping migration")
 
                 # Check ligature inference
-                ligatures = self._detect_ligatures()
-                existing_liga_components = self._get_existing_liga_components()
-                new_ligatures = [
-                    lig
-                    for lig in ligatures
-                    if tuple(lig[0]) not in existing_liga_components
-                ]
-
-                if new_ligatures:
+                ligatures, marks, existing_liga_components = self._analyze_glyphs()
+                new_count = sum(
+                    1
+                    for components, _ in ligatures
+                    if tuple(components) not in existing_liga_components
+                )
+
+                if new_count:
                     plan.can_infer_liga = True
-                    plan.liga_count = len(new_ligatures)
-                    if len(new_ligatures) < len(ligatures):
+                    plan.liga_count = new_count
+                    if new_count < len(ligatures):
                         result.add_info(
-                            f"Can add {len(new_ligatures)} ligatures "
-                            f"({len(ligatures) - len(new_ligatures)} already exist)"
+                            f"Can add {new_count} ligatures "
+                            f"({len(ligatures) - new_count} already exist)"
                         )
                     else:
                         result.add_info(
-                            f"Can infer {len(new_ligatures)} ligatures from glyph names"
+                            f"Can infer {new_count} ligatures from glyph names"
                         )
 
                 # Check GDEF enrichment
-                if not self.state.gdef_has_classes or not self.state.gdef_has_carets:
+                if not state.gdef_has_classes or not state.gdef_has_carets:
                     plan.can_enrich_gdef = True
 
-                    if not self.state.gdef_has_classes:
-                        marks = self._detect_marks()
+                    if not state.gdef_has_classes:
                         plan.mark_count = len(marks)
                         if marks:
                             result.add_info(f"Can classify {len(marks)} mark glyphs")
 
-                    if not self.state.gdef_has_carets and ligatures:
+                    if not state.gdef_has_carets and ligatures:
                         plan.ligature_caret_count = len(ligatures)
                         result.add_info(
                             f"Can add carets for {len(ligatures)} ligatures",
@@ -194,19 +206,19 @@ class WrapperStrategyEngine:
                         )
 
         # Validate any destructive operations
-        if user_preferences.get("overwrite_cmap") and self.state.has_unicode_cmap:
+        if user_preferences.get("overwrite_cmap") and state.has_unicode_cmap:
             cmap_result = self.validator.validate_cmap_operation(overwrite=True)
-            result.messages.extend(cmap_result.messages)
+            result.merge(cmap_result)
             if cmap_result.has_errors():
                 result.success = False
 
         # Check for problematic overwrites
-        for table in ["gdef", "gsub", "gpos"]:
-            if user_preferences.get(f"overwrite_{table}"):
+        for pref, table_tag in _OTL_TABLES:
+            if user_preferences.get(pref):
                 table_result = self.validator.validate_otl_operation(
-                    table.upper(), overwrite=True
+                    table_tag, overwrite=True
                 )
-                result.messages.extend(table_result.messages)
+                result.merge(table_result)
                 if table_result.has_errors():
                     result.success = False
 
@@ -221,33 +233,23 @@ class WrapperStrategyEngine:
 
         return plan, result
 
-    def _detect_ligatures(self) -> List[tuple]:
-        """Detect ligature opportunities."""
-        detector = UnifiedGlyphDetector(self.font)
-        features = detector.get_features()
-        return features["liga"]
-
-    def _get_existing_liga_components(self) -> Set[tuple]:
-        """Get component sequences of existing ligatures."""
-        components = set()
-        if "GSUB" in self.font:
-            gsub = self.font["GSUB"].table
-            if hasattr(gsub, "LookupList") and gsub.LookupList:
-                for lookup in gsub.LookupList.Lookup:
-                    if lookup.LookupType == 4:  # Ligature
-                        for subtable in lookup.SubTable:
-                            if hasattr(subtable, "ligatures"):
-                                for first_glyph, lig_list in subtable.ligatures.items():
-                                    for lig in lig_list:
-                                        comp_tuple = tuple(
-                                            [first_glyph] + lig.Component
-                                        )
-                                        components.add(comp_tuple)
-        return components
-
-    def _detect_marks(self) -> Set[str]:
-        """Detect mark glyphs."""
-        return self.validator._detect_marks()
+    def _analyze_glyphs(self) -> Tuple[List[tuple], Set[str], Set[tuple]]:
+        """Detect ligature candidates, marks and existing ligatures together."""
+        return UnifiedGlyphDetector(self.font).analyze_all(self._gsub_lookup_list())
+
+    def _gsub_lookup_list(self):
+        """The font's GSUB LookupList, or None."""
+        if "GSUB" not in self.font:
+            return None
+        return getattr(self.font["GSUB"].table, "LookupList", None)
+
+
+def _create_unicode_cmap(font: TTFont) -> Tuple[bool, List[str]]:
+    """Run create_cmap, leading its messages with a summary when it changed."""
+    changed, msgs = create_cmap(font, overwrite_unicode=False)
+    if changed:
+        msgs = ["Created Unicode cmap", *msgs]
+    return changed, msgs
 
 
 class WrapperExecutor:
@@ -265,48 +267,22 @@ class WrapperExecutor:
             (result, has_changes) - result with messages, and boolean indicating if any changes were made
         """
         result = OperationResult(success=True)
-        has_changes = False
-
-        # Execute scaffolding operations
-        if self.plan.needs_cmap:
-            changed, msgs = create_cmap(self.font, overwrite_unicode=False)
-            if changed:
-                has_changes = True
-                result.add_info("Created Unicode cmap")
-            for msg in msgs:
-                result.add_info(msg)
-
-        if self.plan.needs_gdef:
-            changed, msg = create_gdef(self.font, overwrite=False)
-            if changed:
-                has_changes = True
-                result.add_info(msg)
-            else:
-                result.add_info(msg)
-
-        if self.plan.needs_gpos:
-            changed, msg = create_gpos(self.font, overwrite=False)
-            if changed:
-                has_changes = True
-                result.add_info(msg)
-            else:
-                result.add_info(msg)
-
-        if self.plan.needs_gsub:
-            changed, msg = create_gsub(self.font, overwrite=False)
-            if changed:
-                has_changes = True
-                result.add_info(msg)
-            else:
-                result.add_info(msg)
-
-        # DSIG is handled separately in user_prefs
-        if self.plan.needs_dsig:
-            changed, msg = create_dsig_stub(self.font, enable=True)
-            if changed:
-                has_changes = True
-                result.add_info(msg)
-            else:
+        has_changes = 0  # OR-ed with each step's flag, coerced on return
+
+        # Execute scaffolding operations (DSIG is handled separately in user_prefs)
+        steps = (
+            (self.plan.needs_cmap, _create_unicode_cmap, {}),
+            (self.plan.needs_gdef, create_gdef, {"overwrite": False}),
+            (self.plan.needs_gpos, create_gpos, {"overwrite": False}),
+            (self.plan.needs_gsub, create_gsub, {"overwrite": False}),
+            (self.plan.needs_dsig, create_dsig_stub, {"enable": True}),
+        )
+        for needed, create, kwargs in steps:
+            if not needed:
+                continue
+            changed, msgs = create(self.font, **kwargs)
+            has_changes |= changed
+            for msg in [msgs] if isinstance(msgs, str) else msgs:
                 result.add_info(msg)
 
         # Execute enrichment operations
@@ -323,8 +299,8 @@ class WrapperExecutor:
                 do_lig_carets=self.plan.ligature_caret_count > 0,
                 drop_kern_after=False,  # Controlled by user preference
             )
+            has_changes |= e_changed
             if e_changed:
-                has_changes = True
                 # Categorize enrichment messages
                 enrichment_summary = []
                 for msg in e_msgs:
@@ -351,4 +327,4 @@ class WrapperExecutor:
                 for msg in e_msgs:
                     result.add_info(msg)
 
-        return result, has_changes
+        return result, bool(has_changes)